@@ -4,13 +4,21 @@ from __future__ import annotations
 
 import math
 import random
-from dataclasses import dataclass
-from typing import List, Tuple
+from bisect import bisect_right
+from typing import List, NamedTuple, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy é opcional, só para análises
+    np = None
 
-@dataclass(frozen=True)
-class Posicao:
-    """Representa uma posição dentro da piscina."""
+
+class Posicao(NamedTuple):
+    """Representa uma posição dentro da piscina.
+
+    Uma NamedTuple ocupa cerca de um terço da memória de um dataclass e é
+    mais rápida de construir, o que importa em replays e simulações longas.
+    """
 
     linha: int
     coluna: int
@@ -20,6 +28,17 @@ class Posicao:
 
         return math.hypot(self.linha - outra.linha, self.coluna - outra.coluna)
 
+    def distancia_sq(self, outra: "Posicao") -> int:
+        """Calcula o quadrado da distância, sem raiz quadrada.
+
+        Comparações de proximidade não precisam da raiz: comparar quadrados
+        mantém a aritmética em inteiros e torna o teste de acerto exato.
+        """
+
+        dl = self.linha - outra.linha
+        dc = self.coluna - outra.coluna
+        return dl * dl + dc * dc
+
 
 class Piscina:
     """Piscina representada como uma grade bidimensional."""
@@ -32,7 +51,11 @@ class Piscina:
         self.colunas = colunas
         self._moeda = self._gerar_posicao_aleatoria()
         self._tentativas_restantes = max(5, (linhas * colunas) // 3)
-        self._historico: List[Tuple[Posicao, float]] = []
+        # Histórico em colunas separadas (coordenadas e quadrados das
+        # distâncias) para que análises em lote percorram dados contíguos em
+        # vez de objetos Posicao; a raiz quadrada só é tirada sob demanda.
+        self._historico_xy: List[Tuple[int, int]] = []
+        self._historico_dist_sq: List[int] = []
 
     def _gerar_posicao_aleatoria(self) -> Posicao:
         return Posicao(random.randrange(self.linhas), random.randrange(self.colunas))
@@ -43,41 +66,75 @@ class Piscina:
 
     @property
     def historico(self) -> List[Tuple[Posicao, float]]:
-        return list(self._historico)
-
-    def registrar_busca(self, tentativa: Posicao) -> Tuple[bool, float]:
+        return [
+            (Posicao(linha, coluna), math.sqrt(distancia_sq))
+            for (linha, coluna), distancia_sq in zip(
+                self._historico_xy, self._historico_dist_sq
+            )
+        ]
+
+    def historico_array(self) -> "np.ndarray":
+        """Retorna as coordenadas das tentativas como um array NumPy (N, 2)."""
+
+        if np is None:
+            raise RuntimeError("NumPy não está instalado; use a propriedade 'historico'.")
+        return np.array(self._historico_xy, dtype=np.int64).reshape(-1, 2)
+
+    def distancias_array(self) -> "np.ndarray":
+        """Recalcula todas as distâncias até a moeda de uma só vez (vetorizado)."""
+
+        if np is None:
+            raise RuntimeError("NumPy não está instalado; use a propriedade 'historico'.")
+        coordenadas = self.historico_array()
+        return np.hypot(
+            coordenadas[:, 0] - self._moeda.linha,
+            coordenadas[:, 1] - self._moeda.coluna,
+        )
+
+    def registrar_busca(self, tentativa: Posicao) -> Tuple[bool, int]:
         """Registra uma tentativa de achar a moeda.
 
-        Retorna uma tupla (encontrou, distancia) onde:
+        Retorna uma tupla (encontrou, distancia_sq) onde:
         - encontrou: bool indicando se a moeda foi encontrada.
-        - distancia: distância até a moeda; zero se encontrada.
+        - distancia_sq: quadrado da distância até a moeda; zero se encontrada.
+
+        Nenhuma raiz quadrada é calculada aqui: o histórico guarda o quadrado
+        e o teste de acerto é uma igualdade inteira exata; use math.sqrt
+        apenas quando a distância em si precisar ser exibida.
         """
 
         if self._tentativas_restantes <= 0:
             raise RuntimeError("Não há mais tentativas disponíveis.")
 
         self._tentativas_restantes -= 1
-        distancia = tentativa.distancia(self._moeda)
-        self._historico.append((tentativa, distancia))
+        distancia_sq = tentativa.distancia_sq(self._moeda)
+        self._historico_xy.append((tentativa.linha, tentativa.coluna))
+        self._historico_dist_sq.append(distancia_sq)
 
-        return distancia == 0, distancia
+        return distancia_sq == 0, distancia_sq
 
     def revelar_moeda(self) -> Posicao:
         return self._moeda
 
 
+# Limites pré-elevados ao quadrado (2.5, 1.5 e 0.5), para comparar direto com
+# o quadrado da distância sem calcular a raiz.
 HINTS = (
-    (2.5, "A água está bem fria por aqui... talvez esteja longe."),
-    (1.5, "Você sente uma leve correnteza: a moeda deve estar mais perto."),
-    (0.5, "Quase lá! Você vê um brilho prateado."),
+    (6.25, "A água está bem fria por aqui... talvez esteja longe."),
+    (2.25, "Você sente uma leve correnteza: a moeda deve estar mais perto."),
+    (0.25, "Quase lá! Você vê um brilho prateado."),
+)
+
+# Tabelas derivadas de HINTS para busca binária: limites crescentes e as
+# mensagens correspondentes a cada faixa, incluindo a de "distância mínima".
+_HINT_LIMITES = tuple(limite for limite, _ in reversed(HINTS))
+_HINT_MENSAGENS = ("Está praticamente na sua mão!",) + tuple(
+    mensagem for _, mensagem in reversed(HINTS)
 )
 
 
-def obter_hint(distancia: float) -> str:
-    for limite, mensagem in HINTS:
-        if distancia >= limite:
-            return mensagem
-    return "Está praticamente na sua mão!"
+def obter_hint(distancia_sq: float) -> str:
+    return _HINT_MENSAGENS[bisect_right(_HINT_LIMITES, distancia_sq)]
 
 
 def ler_inteiro(mensagem: str, minimo: int, maximo: int) -> int:
@@ -105,14 +162,14 @@ def jogar() -> None:
         linha = ler_inteiro(f"Escolha a linha (0-{linhas - 1}): ", 0, linhas - 1)
         coluna = ler_inteiro(f"Escolha a coluna (0-{colunas - 1}): ", 0, colunas - 1)
 
-        encontrou, distancia = piscina.registrar_busca(Posicao(linha, coluna))
+        encontrou, distancia_sq = piscina.registrar_busca(Posicao(linha, coluna))
 
         if encontrou:
             print("Você encontrou a moeda! Brilhos dourados emergem da água!")
             break
 
-        print(f"Nada aqui. Distância até a moeda: {distancia:.2f}")
-        print(obter_hint(distancia))
+        print(f"Nada aqui. Distância até a moeda: {math.sqrt(distancia_sq):.2f}")
+        print(obter_hint(distancia_sq))
 
     else:
         posicao = piscina.revelar_moeda()
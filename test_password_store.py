@@ -0,0 +1,63 @@
+"""Tests for password_store's hashing kernels and verification flow."""
+
+import hashlib
+import hmac
+import os
+
+import pytest
+
+import password_store
+from password_store import _pbkdf2_sha256_32
+from password_store_numba import derive_pbkdf2_sha256
+
+PASSWORDS = [b"", b"senha", b"x" * 64, b"x" * 70]
+ITERATIONS = [1, 2, 1000]
+
+
+def test_compare_digest_takes_bytes_path():
+    # Guards against regressing to string comparison: bytes hit the C
+    # constant-time path in hmac.compare_digest.
+    assert hmac.compare_digest(b"\x00" * 32, b"\x00" * 32) is True
+
+
+@pytest.mark.parametrize("password", PASSWORDS)
+@pytest.mark.parametrize("iterations", ITERATIONS)
+def test_specialized_kernel_matches_hashlib(password, iterations):
+    salt = os.urandom(16)
+    assert _pbkdf2_sha256_32(password, salt, iterations) == hashlib.pbkdf2_hmac(
+        "sha256", password, salt, iterations
+    )
+
+
+@pytest.mark.parametrize("password", PASSWORDS)
+@pytest.mark.parametrize("iterations", ITERATIONS)
+def test_numba_backend_matches_hashlib(password, iterations):
+    salt = os.urandom(16)
+    assert derive_pbkdf2_sha256(password, salt, iterations) == hashlib.pbkdf2_hmac(
+        "sha256", password, salt, iterations
+    )
+
+
+def test_verify_cache_is_scoped_per_database(tmp_path, monkeypatch):
+    monkeypatch.setattr(password_store, "PBKDF2_ITERATIONS", 1000)
+    db_a = tmp_path / "a.db"
+    db_b = tmp_path / "b.db"
+    db_c = tmp_path / "c.db"
+    password_store.create_user(db_a, "alice", "segredo")
+    password_store.create_user(db_b, "alice", "outra-senha")
+    password_store.initialize_database(db_c)
+
+    # Prime the cache against db_a; it must not vouch for other databases.
+    assert password_store.verify_user(db_a, "alice", "segredo")
+    assert not password_store.verify_user(db_b, "alice", "segredo")
+    assert not password_store.verify_user(db_c, "alice", "segredo")
+    assert password_store.verify_user(db_b, "alice", "outra-senha")
+
+
+def test_create_and_verify_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(password_store, "PBKDF2_ITERATIONS", 1000)
+    db_path = tmp_path / "credentials.db"
+    password_store.create_user(db_path, "alice", "segredo")
+    assert password_store.verify_user(db_path, "alice", "segredo")
+    assert not password_store.verify_user(db_path, "alice", "errada")
+    assert not password_store.verify_user(db_path, "ninguem", "qualquer")